@@ -144,7 +144,6 @@ class App(Frame):  # pylint: disable=too-many-ancestors
         """
 
         self.__master.bind("<<ubx_read>>", self.serial_handler.on_read)
-        self.__master.bind("<<ubx_readfile>>", self.serial_handler.on_read)
         self.__master.bind("<<ubx_eof>>", self.serial_handler.on_eof)
         self.__master.bind_all("<Control-q>", self.on_exit)
 
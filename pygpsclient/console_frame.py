@@ -99,36 +99,57 @@ class ConsoleFrame(Frame):
         'maxlines' defines the maximum number of scrollable lines that are
         retained in the text box on a FIFO basis.
 
-        :param str data: data from input stream
+        :param bytes raw_data: raw data
+        :param object parsed_data: parsed data
 
         """
 
+        self.update_console_batch([(raw_data, parsed_data)])
+
+    def update_console_batch(self, data: list):
+        """
+        Print a batch of data to the console in raw (NMEA) or
+        parsed (key,value pair) format, redrawing the console once
+        for the whole batch.
+
+        :param list data: list of (raw_data, parsed_data) tuples
+
+        """
+
+        if not data:
+            return
+        maxlines = self.__app.frm_settings.maxlines
+        data = data[-maxlines:]  # earlier lines would be trimmed anyway
+
         self.txt_console.configure(font=FONT_FIXED)
-        if self.__app.frm_settings.display_format == FORMATS[1]:  # binary
-            data = str(raw_data).strip("\n")
-        elif self.__app.frm_settings.display_format == FORMATS[2]:  # hex string
-            data = str(raw_data.hex())
-        elif self.__app.frm_settings.display_format == FORMATS[3]:  # hex tabular
-            data = hextable(raw_data)
+        display_format = self.__app.frm_settings.display_format
+        if display_format == FORMATS[1]:  # binary
+            lines = [str(raw_data).strip("\n") for raw_data, _ in data]
+        elif display_format == FORMATS[2]:  # hex string
+            lines = [str(raw_data.hex()) for raw_data, _ in data]
+        elif display_format == FORMATS[3]:  # hex tabular
+            lines = [hextable(raw_data) for raw_data, _ in data]
         else:
             self.txt_console.configure(font=FONT_TEXT)
-            data = str(parsed_data)
+            lines = [str(parsed_data) for _, parsed_data in data]
 
         con = self.txt_console
         con.configure(state="normal")
-        con.insert(END, data + "\n")
+        for line in lines:
+            con.insert(END, line + "\n")
 
-        # format of this array of tuples is (tag, highlight color)
-        if TAG_COLORS:  # amend in globals.py if required
-            self._tag_line(data, TAGS)
+            # format of this array of tuples is (tag, highlight color)
+            if TAG_COLORS:  # amend in globals.py if required
+                self._tag_line(line, TAGS)
 
-        idx = float(con.index("end"))  # Lazy but it works
-        if idx > self.__app.frm_settings.maxlines:
+        idx = int(float(con.index("end")))  # Lazy but it works
+        excess = idx - maxlines
+        if excess > 0:
             # Remember these tcl indices look like floats but they're not!
             # ("1.0:, "2.0") signifies "from the first character in
             # line 1 (inclusive) to the first character in line 2 (exclusive)"
-            # i.e. delete the first line
-            con.delete("1.0", "2.0")
+            # i.e. delete the first line, so this deletes the first 'excess' lines
+            con.delete("1.0", f"{excess + 1}.0")
 
         con.update()
         if self.__app.frm_settings.autoscroll:
@@ -52,6 +52,11 @@ MAX_SNR = 60  # upper limit of graphview snr axis
 DEVICE_ACCURACY = 2.5  # nominal GPS device accuracy (CEP) in meters
 HDOP_RATIO = 20  # arbitrary calibration of accuracy against HDOP
 MAXLOGLINES = 10000  # maximum number of 'lines' per datalog file
+READFILE_BLOCKSIZE = 65536  # size of blocks read from datalog file
+READ_WAIT_TIMEOUT = 0.25  # maximum time serial reader waits for data (seconds)
+RXQUEUE_MAXSIZE = 1000  # maximum number of messages awaiting display
+READ_BATCH_MAX = 50  # maximum number of messages displayed per read event
+THREAD_JOIN_TIMEOUT = 1.0  # maximum time to wait for reader thread to stop (seconds)
 # default error handling behaviour for UBXReader.read() calls
 # 0 (ERR_IGNORE) = ignore errors, 1 (ERR_LOG) - log errors, 2 (ERR_RAISE) = raise errors
 QUITONERRORDEFAULT = 1
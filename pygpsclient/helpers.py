@@ -15,9 +15,18 @@ Created on 17 Apr 2021
 from subprocess import run as subrun
 from sys import executable
 from tkinter import Toplevel, Label, Button, W
-from math import sin, cos, pi
+from math import sin, cos, pi, radians
 from pygpsclient.globals import MAX_SNR
 
+# unit conversion factors
+_M_TO_FT = 3.28084
+_MS_TO_KMPH = 3.6
+_MS_TO_MPH = 2.23693674
+_MS_TO_KNOTS = 1.94384395
+_KMPH_TO_MS = 0.2777778
+_KNOTS_TO_MS = 0.5144447324
+_DEG_TO_RAD = pi / 180
+
 
 class ConfirmBox(Toplevel):
     """
@@ -84,7 +93,7 @@ class ConfirmBox(Toplevel):
         my = self.__master.winfo_y()
         mw = self.__master.winfo_width()
         mh = self.__master.winfo_height()
-        self.geometry(f"+{int(mx + (mw/2 - dw/2))}+{int(my + (mh/2 - dh/2))}")
+        self.geometry(f"+{mx + (mw - dw) // 2}+{my + (mh - dh) // 2}")
 
     def show(self):
         """
@@ -109,9 +118,10 @@ def deg2rad(deg: float) -> float:
 
     """
 
-    if not isinstance(deg, (float, int)):
+    try:
+        return deg * _DEG_TO_RAD
+    except TypeError:
         return 0
-    return deg * pi / 180
 
 
 def cel2cart(elevation: float, azimuth: float) -> tuple:
@@ -127,10 +137,11 @@ def cel2cart(elevation: float, azimuth: float) -> tuple:
 
     if not (isinstance(elevation, (float, int)) and isinstance(azimuth, (float, int))):
         return (0, 0)
-    elevation = deg2rad(elevation)
-    azimuth = deg2rad(azimuth)
-    x = cos(azimuth) * cos(elevation)
-    y = sin(azimuth) * cos(elevation)
+    elevation = radians(elevation)
+    azimuth = radians(azimuth)
+    cos_elev = cos(elevation)
+    x = cos(azimuth) * cos_elev
+    y = sin(azimuth) * cos_elev
     return (x, y)
 
 
@@ -154,14 +165,16 @@ def deg2dms(degrees: float, latlon: str) -> str:
         sfx = "S" if latlon == "lat" else "W"
     else:
         sfx = "N" if latlon == "lat" else "E"
-    return (
-        str(int(degrees))
-        + "\u00b0"
-        + str(int(minutes))
-        + "\u2032"
-        + str(round(seconds, 3))
-        + "\u2033"
-        + sfx
+    return "".join(
+        (
+            str(int(degrees)),
+            "\u00b0",
+            str(int(minutes)),
+            "\u2032",
+            str(round(seconds, 3)),
+            "\u2033",
+            sfx,
+        )
     )
 
 
@@ -185,7 +198,7 @@ def deg2dmm(degrees: float, latlon: str) -> str:
         sfx = "S" if latlon == "lat" else "W"
     else:
         sfx = "N" if latlon == "lat" else "E"
-    return str(int(degrees)) + "\u00b0" + str(round(minutes, 5)) + "\u2032" + sfx
+    return f"{int(degrees)}\u00b0{round(minutes, 5)}\u2032{sfx}"
 
 
 def m2ft(meters: float) -> float:
@@ -198,9 +211,10 @@ def m2ft(meters: float) -> float:
 
     """
 
-    if not isinstance(meters, (float, int)):
+    try:
+        return meters * _M_TO_FT
+    except TypeError:
         return 0
-    return meters * 3.28084
 
 
 def ft2m(feet: float) -> float:
@@ -214,9 +228,10 @@ def ft2m(feet: float) -> float:
 
     """
 
-    if not isinstance(feet, (float, int)):
+    try:
+        return feet / _M_TO_FT
+    except TypeError:
         return 0
-    return feet / 3.28084
 
 
 def ms2kmph(ms: float) -> float:
@@ -229,9 +244,10 @@ def ms2kmph(ms: float) -> float:
 
     """
 
-    if not isinstance(ms, (float, int)):
+    try:
+        return ms * _MS_TO_KMPH
+    except TypeError:
         return 0
-    return ms * 3.6
 
 
 def ms2mph(ms: float) -> float:
@@ -244,9 +260,10 @@ def ms2mph(ms: float) -> float:
 
     """
 
-    if not isinstance(ms, (float, int)):
+    try:
+        return ms * _MS_TO_MPH
+    except TypeError:
         return 0
-    return ms * 2.23693674
 
 
 def ms2knots(ms: float) -> float:
@@ -259,9 +276,10 @@ def ms2knots(ms: float) -> float:
 
     """
 
-    if not isinstance(ms, (float, int)):
+    try:
+        return ms * _MS_TO_KNOTS
+    except TypeError:
         return 0
-    return ms * 1.94384395
 
 
 def kmph2ms(kmph: float) -> float:
@@ -274,9 +292,10 @@ def kmph2ms(kmph: float) -> float:
 
     """
 
-    if not isinstance(kmph, (float, int)):
+    try:
+        return kmph * _KMPH_TO_MS
+    except TypeError:
         return 0
-    return kmph * 0.2777778
 
 
 def knots2ms(knots: float) -> float:
@@ -289,9 +308,10 @@ def knots2ms(knots: float) -> float:
 
     """
 
-    if not isinstance(knots, (float, int)):
+    try:
+        return knots * _KNOTS_TO_MS
+    except TypeError:
         return 0
-    return knots * 0.5144447324
 
 
 def pos2iso6709(lat: float, lon: float, alt: float, crs: str = "WGS_84") -> str:
@@ -316,18 +336,9 @@ def pos2iso6709(lat: float, lon: float, alt: float, crs: str = "WGS_84") -> str:
     lati = "-" if lat < 0 else "+"
     loni = "-" if lon < 0 else "+"
     alti = "-" if alt < 0 else "+"
-    iso6709 = (
-        lati
-        + str(abs(lat))
-        + loni
-        + str(abs(lon))
-        + alti
-        + str(alt)
-        + "CRS"
-        + crs
-        + "/"
+    return "".join(
+        (lati, str(abs(lat)), loni, str(abs(lon)), alti, str(abs(alt)), "CRS", crs, "/")
     )
-    return iso6709
 
 
 def hsv2rgb(h: float, s: float, v: float) -> str:
@@ -350,35 +361,58 @@ def hsv2rgb(h: float, s: float, v: float) -> str:
     p = int(v * (1.0 - s))
     q = int(v * (1.0 - s * f))
     t = int(v * (1.0 - s * (1.0 - f)))
-    i %= 6
-    if i == 0:
-        r, g, b = v, t, p
-    if i == 1:
-        r, g, b = q, v, p
-    if i == 2:
-        r, g, b = p, v, t
-    if i == 3:
-        r, g, b = p, q, v
-    if i == 4:
-        r, g, b = t, p, v
-    if i == 5:
-        r, g, b = v, p, q
+    sectors = ((v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q))
+    r, g, b = sectors[i % 6]
 
     return f"#{r:02x}{g:02x}{b:02x}"
 
 
+# precomputed snr2col colors for each integer snr in range 0 to MAX_SNR
+_SNR_COLOR_LUT = [
+    hsv2rgb(snr / (MAX_SNR * 2.5), 0.8, 0.8) for snr in range(MAX_SNR + 1)
+]
+
+
 def snr2col(snr: int) -> str:
     """
     Convert satellite signal-to-noise ratio to a color
     high = green, low = red.
 
-    :param int snr: signal to noise ratio as integer
+    :param int snr: signal to noise ratio as integer (clamped to 0 - MAX_SNR)
     :return: rgb color string
     :rtype: str
 
     """
 
-    return hsv2rgb(snr / (MAX_SNR * 2.5), 0.8, 0.8)
+    return _SNR_COLOR_LUT[min(max(int(snr), 0), MAX_SNR)]
+
+
+def _svid_gnssid_lut() -> bytes:
+    """
+    Build lookup table of gnssId for each svid in range 0-255.
+
+    :return: gnssId indexed by svid
+    :rtype: bytes
+
+    """
+
+    lut = bytearray(256)  # default 0 = GPS
+    for gnssId, svids in (
+        (1, range(120, 159)),  # SBAS
+        (2, range(211, 247)),  # Galileo
+        (3, range(159, 164)),  # Beidou
+        (3, range(33, 65)),  # Beidou
+        (4, range(173, 183)),  # IMES
+        (5, range(193, 203)),  # QZSS
+        (6, range(65, 97)),  # GLONASS
+        (6, (255,)),  # GLONASS
+    ):
+        for svid in svids:
+            lut[svid] = gnssId
+    return bytes(lut)
+
+
+_SVID_GNSSID = _svid_gnssid_lut()
 
 
 def svid2gnssid(svid) -> int:
@@ -391,21 +425,7 @@ def svid2gnssid(svid) -> int:
 
     """
 
-    if 120 <= svid <= 158:
-        gnssId = 1  # SBAS
-    elif 211 <= svid <= 246:
-        gnssId = 2  # Galileo
-    elif (159 <= svid <= 163) or (33 <= svid <= 64):
-        gnssId = 3  # Beidou
-    elif 173 <= svid <= 182:
-        gnssId = 4  # IMES
-    elif 193 <= svid <= 202:
-        gnssId = 5  # QZSS
-    elif (65 <= svid <= 96) or svid == 255:
-        gnssId = 6  # GLONASS
-    else:
-        gnssId = 0  # GPS
-    return gnssId
+    return _SVID_GNSSID[svid] if 0 <= svid < 256 else 0
 
 
 def check_for_update(name: str) -> tuple:
@@ -91,6 +91,16 @@ class NMEAHandler:
         ):  # GPS Lat/Lon & Acc Data
             self._process_UBX00(parsed_data)
 
+    def process_data_batch(self, data: list):
+        """
+        Process batch of NMEA messages
+
+        :param list data: list of (raw_data, parsed_data) tuples
+        """
+
+        for raw_data, parsed_data in data:
+            self.process_data(raw_data, parsed_data)
+
     def _process_RMC(self, data: NMEAMessage):
         """
         Process RMC sentence - Recommended minimum data for GPS.
@@ -12,17 +12,36 @@ Created on 16 Sep 2020
 """
 
 import logging
-from io import BufferedReader
-from threading import Thread
+import sys
+from queue import Queue, Empty, Full
+from select import select
+from threading import Thread, Event
 from serial import Serial, SerialException, SerialTimeoutException
-from pynmeagps import NMEAReader, NMEAParseError
-from pyubx2 import UBXReader, UBXParseError, protocol
+from pynmeagps import (
+    NMEAParseError,
+    NMEAStreamError,
+    NMEAMessageError,
+    NMEATypeError,
+)
+from pyubx2 import (
+    UBXReader,
+    UBXParseError,
+    UBXStreamError,
+    UBXMessageError,
+    UBXTypeError,
+    protocol,
+)
 import pyubx2.ubxtypes_core as ubt
 from pygpsclient.globals import (
     CONNECTED,
     CONNECTED_FILE,
     DISCONNECTED,
-    CRLF,
+    READFILE_BLOCKSIZE,
+    READ_WAIT_TIMEOUT,
+    THREAD_JOIN_TIMEOUT,
+    RXQUEUE_MAXSIZE,
+    READ_BATCH_MAX,
+    QUITONERRORDEFAULT,
 )
 from pygpsclient.strings import NOTCONN, SEROPENERROR, ENDOFFILE
 
@@ -46,11 +65,17 @@ class SerialHandler:
         self.__master = self.__app.get_master()  # Reference to root class (Tk)
 
         self._serial_object = None
-        self._serial_buffer = None
+        self._stream = None  # input stream read by UBXReader
+        self._reader = None
         self._serial_thread = None
         self._file_thread = None
         self._connected = False
-        self._reading = False
+        self._stop = Event()  # stop flag for current reader thread
+        self._stop.set()
+        # (raw, parsed, msgprot) awaiting processing; bounded so that
+        # reader threads block rather than run ahead of the display
+        self._rx_queue = Queue(maxsize=RXQUEUE_MAXSIZE)
+        self._event_pending = False  # True if a <<ubx_read>> event is outstanding
 
         logging.basicConfig(
             format="%(asctime)-15s [%(levelname)s] %(funcName)s: %(message)s",
@@ -63,8 +88,7 @@ class SerialHandler:
         """
 
         if self._serial_thread is not None:
-            self._reading = False
-            self._serial_thread = None
+            self.stop_read_thread()
             self.disconnect()
 
     def connect(self):
@@ -88,7 +112,9 @@ class SerialHandler:
                 rtscts=serial_settings.rtscts,
                 timeout=serial_settings.timeout,
             )
-            self._serial_buffer = BufferedReader(self._serial_object)
+            # Serial maintains its own input buffer, so read from it directly
+            self._stream = self._serial_object
+            self.set_reader()
             self.__app.frm_banner.update_conn_status(CONNECTED)
             self.__app.set_connection(
                 (
@@ -132,8 +158,11 @@ class SerialHandler:
             return
 
         try:
-            self._serial_object = open(in_filepath, "rb")
-            self._serial_buffer = BufferedReader(self._serial_object)
+            self._serial_object = open(
+                in_filepath, "rb", buffering=READFILE_BLOCKSIZE
+            )
+            self._stream = self._serial_object
+            self.set_reader()
             self.__app.frm_banner.update_conn_status(CONNECTED_FILE)
             self.__app.set_connection(f"{in_filepath}", "blue")
             self.__app.frm_settings.enable_controls(CONNECTED_FILE)
@@ -160,7 +189,9 @@ class SerialHandler:
 
         if self._connected:
             try:
-                self._reading = False
+                # stop reader threads before closing the port they read from
+                self.stop_read_thread()
+                self.stop_readfile_thread()
                 self._serial_object.close()
                 self.__app.frm_banner.update_conn_status(DISCONNECTED)
                 self.__app.set_connection(NOTCONN, "red")
@@ -178,6 +209,26 @@ class SerialHandler:
         self._connected = False
         self.__app.frm_settings.enable_controls(self._connected)
 
+    def set_reader(self):
+        """
+        (Re)create the UBX/NMEA stream reader using the current protocol
+        filter, so that messages of unselected protocols are discarded
+        by the reader rather than parsed and then ignored.
+        """
+
+        if self._stream is None:
+            return
+
+        protfilter = self.__app.frm_settings.protocol
+        if self.__app.frm_settings.datalogging:
+            # datalog records all protocols, whichever are displayed
+            protfilter = ubt.UBX_PROTOCOL | ubt.NMEA_PROTOCOL
+        self._reader = UBXReader(
+            self._stream,
+            protfilter=protfilter,
+            quitonerror=QUITONERRORDEFAULT,
+        )
+
     @property
     def port(self):
         """
@@ -203,12 +254,12 @@ class SerialHandler:
         return self._serial_object
 
     @property
-    def buffer(self):
+    def stream(self):
         """
-        Getter for serial buffer
+        Getter for input stream
         """
 
-        return self._serial_buffer
+        return self._stream
 
     @property
     def thread(self):
@@ -236,9 +287,12 @@ class SerialHandler:
         """
 
         if self._connected:
-            self._reading = True
+            # new stop flag per thread so a stale thread stays stopped
+            self._stop = Event()
             self.__app.frm_mapview.reset_map_refresh()
-            self._serial_thread = Thread(target=self._read_thread, daemon=True)
+            self._serial_thread = Thread(
+                target=self._read_thread, args=(self._stop,), daemon=True
+            )
             self._serial_thread.start()
 
     def start_readfile_thread(self):
@@ -247,9 +301,11 @@ class SerialHandler:
         """
 
         if self._connected:
-            self._reading = True
+            self._stop = Event()
             self.__app.frm_mapview.reset_map_refresh()
-            self._file_thread = Thread(target=self._readfile_thread, daemon=True)
+            self._file_thread = Thread(
+                target=self._readfile_thread, args=(self._stop,), daemon=True
+            )
             self._file_thread.start()
 
     def stop_read_thread(self):
@@ -258,7 +314,10 @@ class SerialHandler:
         """
 
         if self._serial_thread is not None:
-            self._reading = False
+            self._stop.set()
+            # wake any read blocked waiting for the rest of a message
+            self._serial_object.cancel_read()
+            self._serial_thread.join(timeout=THREAD_JOIN_TIMEOUT)
             self._serial_thread = None
             # self.__app.set_status(STOPDATA, "red")
 
@@ -268,49 +327,155 @@ class SerialHandler:
         """
 
         if self._file_thread is not None:
-            self._reading = False
+            self._stop.set()
+            self._file_thread.join(timeout=THREAD_JOIN_TIMEOUT)
             self._file_thread = None
             # self.__app.set_status(STOPDATA, "red")
 
-    def _read_thread(self):
+    def _read_thread(self, stop: Event):
         """
         THREADED PROCESS
-        Reads binary data from serial port and generates virtual event to
-        trigger data parsing and widget updates.
+        Reads and parses binary data from serial port and places it on
+        the receive queue for widget updates.
+
+        :param Event stop: stop flag for this thread
         """
 
+        pollable = self._pollable()
+        try:
+            while not stop.is_set():
+                if pollable:
+                    # wait until the kernel reports data available
+                    readable, _, _ = select(
+                        [self._serial_object], [], [], READ_WAIT_TIMEOUT
+                    )
+                    if readable:
+                        self._read_data(stop)
+                elif not self._read_data(stop):
+                    # nothing read within port timeout; pace loop
+                    # (returns immediately if reading is stopped)
+                    stop.wait(READ_WAIT_TIMEOUT)
+        except (SerialException, TypeError, ValueError, OSError) as err:
+            # ignore if port closed under thread as it shuts down
+            if not stop.is_set():
+                self.__app.set_status(f"Error in read thread {err}", "red")
+
+    def _pollable(self) -> bool:
+        """
+        Check if serial port can be waited on using select(). This
+        isn't supported for serial ports on Windows, in which case
+        the reader falls back to blocking reads with the port timeout.
+
+        :return: True if select() can be used
+        :rtype: bool
+        """
+
+        if sys.platform == "win32":
+            return False
         try:
-            while self._reading and self._serial_object:
-                if self._serial_object.in_waiting:
-                    self.__master.event_generate("<<ubx_read>>")
-        except SerialException as err:
-            self.__app.set_status(f"Error in read thread {err}", "red")
-        # spurious errors as thread shuts down after serial disconnection
-        except (TypeError, OSError):
-            pass
+            self._serial_object.fileno()
+        except (AttributeError, OSError, ValueError):
+            return False
+        return True
 
-    def _readfile_thread(self):
+    def _readfile_thread(self, stop: Event):
         """
         THREADED PROCESS
-        Reads binary data from datalog file and generates virtual event to
-        trigger data parsing and widget updates.
+        Reads and parses binary data from datalog file and places it on
+        the receive queue for widget updates. Generates virtual event
+        on EOF.
+
+        :param Event stop: stop flag for this thread
+        """
+
+        try:
+            while not stop.is_set():
+                if not self._read_data(stop):
+                    # let remaining data be displayed before signalling EOF
+                    while not self._rx_queue.empty() and not stop.is_set():
+                        stop.wait(READ_WAIT_TIMEOUT)
+                    self.__master.event_generate("<<ubx_eof>>", when="tail")
+                    break
+        except (TypeError, ValueError, OSError) as err:
+            # ignore if file closed under thread as it shuts down
+            if not stop.is_set():
+                self.__app.set_status(f"Error in read thread {err}", "red")
+
+    def _read_data(self, stop: Event) -> bool:
+        """
+        Read and parse the next UBX or NMEA message from the input stream
+        and place it on the receive queue as a (raw, parsed, msgprot) tuple.
+        Parse and stream errors are queued as (error text, error, None)
+        so they can be logged to the console and reading can continue.
+
+        :param Event stop: stop flag for calling thread
+        :return: False if no data was available (EOF or timeout)
+        :rtype: bool
         """
 
-        while self._reading and self._serial_object:
-            self.__master.event_generate("<<ubx_readfile>>")
+        try:
+            raw_data, parsed_data = self._reader.read()
+        except (
+            UBXParseError,
+            UBXStreamError,
+            UBXMessageError,
+            UBXTypeError,
+            NMEAParseError,
+            NMEAStreamError,
+            NMEAMessageError,
+            NMEATypeError,
+        ) as err:
+            self._enqueue((bytes(str(err), "utf-8"), err, None), stop)
+            return True
+        if raw_data is None:
+            return False
+        self._enqueue((raw_data, parsed_data, protocol(raw_data)), stop)
+        return True
+
+    def _enqueue(self, item: tuple, stop: Event):
+        """
+        Place data on the receive queue and, if one is not already
+        outstanding, generate a virtual event to trigger widget updates.
+
+        :param tuple item: (raw, parsed, msgprot) tuple
+        :param Event stop: stop flag for calling thread
+        """
+
+        while not stop.is_set():
+            try:
+                self._rx_queue.put(item, timeout=READ_WAIT_TIMEOUT)
+                break
+            except Full:
+                continue
+        if not self._event_pending and not stop.is_set():
+            self._event_pending = True
+            self.__master.event_generate("<<ubx_read>>", when="tail")
 
     def on_read(self, event):  # pylint: disable=unused-argument
         """
-        Action on <<ubx_read>> event - read any data in the buffer.
+        Action on <<ubx_read>> event - process up to READ_BATCH_MAX items
+        in the receive queue, generating a further event if any remain so
+        that other Tk events can be handled in between.
 
         :param event event: read event
         """
 
-        if self._reading and self._serial_object is not None:
+        # clear flag before draining so that data queued while
+        # we are draining generates a fresh event
+        self._event_pending = False
+        batch = []
+        while len(batch) < READ_BATCH_MAX:
             try:
-                self._parse_data(self._serial_buffer)
-            except SerialException as err:
-                self.__app.set_status(f"Error {err}", "red")
+                item = self._rx_queue.get_nowait()
+            except Empty:
+                break
+            if not self._stop.is_set():
+                batch.append(item)
+        if batch:
+            self._dispatch_data(batch)
+        if not self._rx_queue.empty() and not self._stop.is_set():
+            self._event_pending = True
+            self.__master.event_generate("<<ubx_read>>", when="tail")
 
     def on_eof(self, event):  # pylint: disable=unused-argument
         """
@@ -322,94 +487,53 @@ class SerialHandler:
         self.disconnect()
         self.__app.set_status(ENDOFFILE, "blue")
 
-    def _parse_data(self, stream: object):
+    def _dispatch_data(self, batch: list):
         """
-        Read the binary data and direct to the appropriate
-        UBX and/or NMEA protocol handler, depending on which protocols
-        are filtered.
+        Direct a batch of parsed data to the appropriate UBX and/or NMEA
+        protocol handler, depending on which protocols are filtered.
+        The console and each handler are updated once per batch.
 
-        :param Serial ser: serial port
+        :param list batch: list of (raw, parsed, msgprot) tuples
         """
 
-        parsing = True
-        raw_data = None
-        parsed_data = None
+        # read settings once per batch rather than once per message
         protfilter = self.__app.frm_settings.protocol
-
-        try:
-            while parsing:  # loop until end of valid UBX/NMEA message or EOF
-                byte1 = stream.read(1)  # read first byte to determine protocol
-                if len(byte1) < 1:
-                    raise EOFError
-                if byte1 not in (
-                    b"\xb5",
-                    b"\x24",
-                ):  # not UBX or NMEA, discard and continue
-                    continue
-                byte2 = stream.read(1)
-                if len(byte2) < 1:
-                    raise EOFError
-                # if it's a UBX message (b'\b5\x62')
-                bytehdr = byte1 + byte2
-                if bytehdr == ubt.UBX_HDR:
-                    byten = stream.read(4)
-                    if len(byten) < 4:
-                        raise EOFError
-                    clsid = byten[0:1]
-                    msgid = byten[1:2]
-                    lenb = byten[2:4]
-                    leni = int.from_bytes(lenb, "little", signed=False)
-                    byten = stream.read(leni + 2)
-                    if len(byten) < leni + 2:
-                        raise EOFError
-                    plb = byten[0:leni]
-                    cksum = byten[leni : leni + 2]
-                    raw_data = bytehdr + clsid + msgid + lenb + plb + cksum
-                    parsed_data = UBXReader.parse(raw_data)
-                    parsing = False
-                # if it's an NMEA GNSS message ('$G' or '$P')
-                elif bytehdr in ubt.NMEA_HDR:
-                    byten = stream.readline()
-                    if byten[-2:] != CRLF:
-                        raise EOFError
-                    raw_data = bytehdr + byten
-                    parsed_data = NMEAReader.parse(raw_data)
-                    parsing = False
-                # else drop it like it's hot
-                else:
-                    parsing = False
-        except EOFError:
-            self.__master.event_generate("<<ubx_eof>>")
-            return
-        except (UBXParseError, NMEAParseError) as err:
-            # log errors to console, then continue
-            self.__app.frm_console.update_console(bytes(str(err), "utf-8"), err)
-            return
-
-        logging.debug("raw: %s parsed: %s", raw_data, parsed_data)
-        if raw_data is None or parsed_data is None:
-            return
-        msgprot = protocol(raw_data)
-        if msgprot == ubt.UBX_PROTOCOL and msgprot & protfilter:
-            self.__app.frm_console.update_console(raw_data, parsed_data)
-            self.__app.ubx_handler.process_data(raw_data, parsed_data)
-        elif msgprot == ubt.NMEA_PROTOCOL and msgprot & protfilter:
-            self.__app.frm_console.update_console(raw_data, parsed_data)
-            self.__app.nmea_handler.process_data(raw_data, parsed_data)
-        elif msgprot == 0 and protfilter == 3:
-            # log unknown protocol headers to console, then continue
-            self.__app.frm_console.update_console(raw_data, parsed_data)
-
-        # if datalogging, write to log file
-        if self.__app.frm_settings.datalogging:
-            self.__app.file_handler.write_logfile(raw_data, parsed_data)
+        datalogging = self.__app.frm_settings.datalogging
+
+        console_data = []
+        ubx_data = []
+        nmea_data = []
+        for raw_data, parsed_data, msgprot in batch:
+            if msgprot is None:
+                # log errors to console, then continue
+                console_data.append((raw_data, parsed_data))
+                continue
+
+            logging.debug("raw: %s parsed: %s", raw_data, parsed_data)
+            if parsed_data is None:
+                continue
+            if msgprot == ubt.UBX_PROTOCOL and msgprot & protfilter:
+                console_data.append((raw_data, parsed_data))
+                ubx_data.append((raw_data, parsed_data))
+            elif msgprot == ubt.NMEA_PROTOCOL and msgprot & protfilter:
+                console_data.append((raw_data, parsed_data))
+                nmea_data.append((raw_data, parsed_data))
+            elif msgprot == 0 and protfilter == 3:
+                # log unknown protocol headers to console, then continue
+                console_data.append((raw_data, parsed_data))
+
+            # if datalogging, write to log file
+            if datalogging:
+                self.__app.file_handler.write_logfile(raw_data, parsed_data)
+
+        self.__app.frm_console.update_console_batch(console_data)
+        self.__app.ubx_handler.process_data_batch(ubx_data)
+        self.__app.nmea_handler.process_data_batch(nmea_data)
 
     def flush(self):
         """
         Flush input buffer
         """
 
-        if self._serial_buffer is not None:
-            self._serial_buffer.flush()
-        if self._serial_object is not None:
-            self._serial_object.flushInput()
+        if isinstance(self._serial_object, Serial):
+            self._serial_object.reset_input_buffer()
@@ -177,18 +177,21 @@ class SettingsFrame(Frame):
             text="NMEA",
             variable=self._protocol,
             value=ubt.NMEA_PROTOCOL,
+            command=self._on_protocol,
         )
         self._rad_ubx = Radiobutton(
             self._frm_options,
             text="UBX",
             variable=self._protocol,
             value=ubt.UBX_PROTOCOL,
+            command=self._on_protocol,
         )
         self._rad_all = Radiobutton(
             self._frm_options,
             text="ALL",
             variable=self._protocol,
             value=(ubt.UBX_PROTOCOL | ubt.NMEA_PROTOCOL),
+            command=self._on_protocol,
         )
         self._lbl_consoledisplay = Label(self._frm_options, text=LBLDATADISP)
         self._spn_conformat = Spinbox(
@@ -357,6 +360,13 @@ class SettingsFrame(Frame):
 
         self.__app.frm_mapview.reset_map_refresh()
 
+    def _on_protocol(self):
+        """
+        Apply change of displayed protocols to stream reader
+        """
+
+        self.__app.serial_handler.set_reader()
+
     def _on_data_log(self):
         """
         Start or stop data logger
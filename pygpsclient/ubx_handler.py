@@ -102,6 +102,16 @@ class UBXHandler:
         if parsed_data.identity == "MON-HW":
             self._process_MON_HW(parsed_data)
 
+    def process_data_batch(self, data: list):
+        """
+        Process batch of UBX messages
+
+        :param list data: list of (raw_data, parsed_data) tuples
+        """
+
+        for raw_data, parsed_data in data:
+            self.process_data(raw_data, parsed_data)
+
     def _process_ACK_ACK(self, data: UBXMessage):
         """
         Process CFG-MSG sentence - UBX message configuration.
@@ -20,7 +20,7 @@ setup(
     version=VERSION,
     packages=find_packages(exclude=["tests", "references", "images"]),
     install_requires=[
-        "pyubx2>=1.2.4",
+        "pyubx2>=1.2.5",
         "pynmeagps>=1.0.8",
         "requests>=2.24.0",
         "Pillow>=7.2.0",
@@ -46,6 +46,8 @@ class StaticTest(unittest.TestCase):
     def testms2kmph(self):
         res = ms2kmph(3.654)
         self.assertAlmostEqual(res, 13.154400, 5)
+        res = ms2kmph("3.654")
+        self.assertEqual(res, 0)
 
     def testms2mph(self):
         res = ms2mph(3.654)
@@ -66,18 +68,24 @@ class StaticTest(unittest.TestCase):
     def testpos2iso6709(self):
         res = pos2iso6709(53.12, -2.165, 35)
         self.assertEqual(res, "+53.12-2.165+35CRSWGS_84/")
+        res = pos2iso6709(-53.12, 2.165, -3.5)
+        self.assertEqual(res, "-53.12+2.165-3.5CRSWGS_84/")
 
     def testhsv2rgb(self):
         res = hsv2rgb(0.5, 0.2, 0.9)
         self.assertEqual(res, "#b7e5e5")
+        res = hsv2rgb(1.0, 0.8, 0.8)
+        self.assertEqual(res, "#cc2828")
 
     def testsnr2col(self):
         res = snr2col(38)
         self.assertEqual(res, "#77cc28")
+        self.assertEqual(snr2col(-5), snr2col(0))
+        self.assertEqual(snr2col(99), snr2col(60))
 
     def testsvid2gnss(self):
-        EXPECTED_RESULT = [0, 3, 6, 1, 4, 5, 2]
-        svids = (28, 50, 72, 140, 180, 200, 220)
+        EXPECTED_RESULT = [0, 3, 6, 1, 4, 5, 2, 3, 6, 0]
+        svids = (28, 50, 72, 140, 180, 200, 220, 160, 255, 300)
         for i, svid in enumerate(svids):
             res = svid2gnssid(svid)
             self.assertEqual(res, EXPECTED_RESULT[i])